@@ -0,0 +1,174 @@
+"""
+Memory benchmark for video feature extraction.
+
+Runs extract_video_features in a fresh subprocess per configuration and reports wall time,
+peak NumPy/Python heap (tracemalloc), peak RSS and, when a C compiler is available, the number
+of native allocations >= 1 MiB made during extraction (via a small LD_PRELOAD malloc counter).
+
+    python benchmarks/video_memory.py                      # synthetic 4K clip, 120 frames
+    python benchmarks/video_memory.py --path clip.mp4 --max-frames 60
+
+To compare against another revision, point PYTHONPATH at its src/ (only the default
+"frames" configuration exists before the keyframes/pipelined modes).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+CONFIGS = {
+    "frames": {},
+    "frames-pipelined": {"workers": 2, "queue_depth": 4},
+    "keyframes": {"mode": "keyframes"},
+}
+
+# Counts malloc/calloc/realloc/aligned allocations of at least 1 MiB between mcount_on/off.
+MALLOC_COUNTER_C = r"""
+#define _GNU_SOURCE
+#include <dlfcn.h>
+#include <stddef.h>
+#include <string.h>
+#define BIG (1 << 20)
+static long big = 0;
+static int on = 0;
+static char boot[4096];
+static size_t boot_used = 0;
+static void *(*real_malloc)(size_t);
+static void *(*real_calloc)(size_t, size_t);
+static void *(*real_realloc)(void *, size_t);
+static int (*real_posix_memalign)(void **, size_t, size_t);
+static void *(*real_aligned_alloc)(size_t, size_t);
+static void (*real_free)(void *);
+void mcount_on(void) { big = 0; on = 1; }
+long mcount_off(void) { on = 0; return big; }
+void *malloc(size_t n) {
+    if (!real_malloc) real_malloc = dlsym(RTLD_NEXT, "malloc");
+    if (on && n >= BIG) big++;
+    return real_malloc(n);
+}
+void *calloc(size_t a, size_t b) {
+    if (!real_calloc) {
+        /* dlsym itself may call calloc: serve it from a static buffer */
+        void *p = boot + boot_used;
+        boot_used += a * b;
+        memset(p, 0, a * b);
+        real_calloc = dlsym(RTLD_NEXT, "calloc");
+        return p;
+    }
+    if (on && a * b >= BIG) big++;
+    return real_calloc(a, b);
+}
+void *realloc(void *p, size_t n) {
+    if (!real_realloc) real_realloc = dlsym(RTLD_NEXT, "realloc");
+    if (on && n >= BIG) big++;
+    return real_realloc(p, n);
+}
+int posix_memalign(void **p, size_t a, size_t n) {
+    if (!real_posix_memalign) real_posix_memalign = dlsym(RTLD_NEXT, "posix_memalign");
+    if (on && n >= BIG) big++;
+    return real_posix_memalign(p, a, n);
+}
+void *aligned_alloc(size_t a, size_t n) {
+    if (!real_aligned_alloc) real_aligned_alloc = dlsym(RTLD_NEXT, "aligned_alloc");
+    if (on && n >= BIG) big++;
+    return real_aligned_alloc(a, n);
+}
+void free(void *p) {
+    if ((char *)p >= boot && (char *)p < boot + sizeof(boot)) return;
+    if (!real_free) real_free = dlsym(RTLD_NEXT, "free");
+    real_free(p);
+}
+"""
+
+RUNNER = r"""
+import ctypes, json, os, resource, sys, time, tracemalloc
+from judge_agent.feature_extractors.video_features import extract_video_features
+
+path, kwargs = sys.argv[1], json.loads(sys.argv[2])
+counter = ctypes.CDLL(os.environ["MCOUNT_LIB"]) if os.environ.get("MCOUNT_LIB") else None
+if counter is not None:
+    counter.mcount_off.restype = ctypes.c_long
+    counter.mcount_on()
+tracemalloc.start()
+t = time.perf_counter()
+features = extract_video_features(path, **kwargs)
+elapsed = time.perf_counter() - t
+_, peak = tracemalloc.get_traced_memory()
+tracemalloc.stop()
+print(json.dumps({
+    "time_s": round(elapsed, 2),
+    "frames": features.sampled_frames,
+    "traced_peak_mib": round(peak / 2**20, 1),
+    "maxrss_mib": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    "allocs_1mib": counter.mcount_off() if counter is not None else None,
+}))
+"""
+
+
+def write_synthetic_clip(path: Path, width: int, height: int, n_frames: int) -> None:
+    import cv2
+    import numpy as np
+
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 30, (width, height))
+    for i in range(n_frames):
+        frame = np.full((height, width, 3), (i * 3) % 255, np.uint8)
+        cv2.rectangle(frame, ((i * 5) % width, 50), ((i * 5) % width + 80, 150), (255, 255, 255), -1)
+        cv2.putText(frame, f"frame {i}", (20, height - 20), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 0, 255), 2)
+        writer.write(frame)
+    writer.release()
+
+
+def build_malloc_counter(workdir: Path) -> str | None:
+    cc = shutil.which("cc") or shutil.which("gcc")
+    if cc is None or not sys.platform.startswith("linux"):
+        return None
+    src, lib = workdir / "mcount.c", workdir / "mcount.so"
+    src.write_text(MALLOC_COUNTER_C, encoding="utf-8")
+    p = subprocess.run([cc, "-shared", "-fPIC", "-O2", "-o", str(lib), str(src), "-ldl"], capture_output=True)
+    return str(lib) if p.returncode == 0 else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", help="Video to analyze (default: a synthetic 3840x2160 MJPG clip).")
+    parser.add_argument("--frames", type=int, default=120, help="Length of the synthetic clip.")
+    parser.add_argument("--fps-sample", type=float, default=30.0)
+    parser.add_argument("--max-frames", type=int, default=120)
+    parser.add_argument("--config", action="append", choices=sorted(CONFIGS), help="Repeatable (default: all).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as td:
+        workdir = Path(td)
+        path = args.path
+        if path is None:
+            path = str(workdir / "synthetic_4k.avi")
+            write_synthetic_clip(Path(path), 3840, 2160, args.frames)
+
+        env = dict(os.environ)
+        lib = build_malloc_counter(workdir)
+        if lib is not None:
+            env["MCOUNT_LIB"] = lib
+            env["LD_PRELOAD"] = " ".join(filter(None, [lib, env.get("LD_PRELOAD")]))
+        else:
+            print("note: no C compiler found; allocation counts are skipped", file=sys.stderr)
+
+        for name in args.config or list(CONFIGS):
+            kwargs = {"fps_sample": args.fps_sample, "max_frames": args.max_frames, **CONFIGS[name]}
+            p = subprocess.run(
+                [sys.executable, "-c", RUNNER, path, json.dumps(kwargs)],
+                env=env, capture_output=True, text=True,
+            )
+            if p.returncode != 0:
+                print(f"{name}: failed\n{p.stderr.strip()}", file=sys.stderr)
+                continue
+            print(json.dumps({"config": name, **json.loads(p.stdout.strip().splitlines()[-1])}))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,10 @@
 from __future__ import annotations
 import json
 from pathlib import Path
+from typing import List
 import typer
 
-from judge_agent.pipeline import judge
+from judge_agent.pipeline import judge, rescore as rescore_store
 
 app = typer.Typer(help="Judge agent: AI vs human, virality score, and audience distribution.")
 
@@ -12,9 +13,11 @@ def text(
     path: str = typer.Option(..., help="Path to a text file."),
     out: str = typer.Option(None, help="Optional output JSON file path."),
     debug: bool = typer.Option(False, help="Include debug features in output."),
+    store: str = typer.Option(None, help="Optional feature store directory to append extracted features to."),
+    item_id: str = typer.Option(None, help="Item id used in the feature store (defaults to the file path)."),
 ):
     txt = Path(path).read_text(encoding="utf-8", errors="ignore")
-    result = judge(text=txt, include_debug=debug)
+    result = judge(text=txt, include_debug=debug, feature_store=store, item_id=item_id or path)
     payload = json.dumps(result.model_dump(), indent=2)
 
     if out:
@@ -29,15 +32,29 @@ def video(
     transcript: str = typer.Option(None, help="Optional transcript file (txt)."),
     fps_sample: float = typer.Option(1.0, help="Frames per second to sample."),
     max_frames: int = typer.Option(60, help="Max frames to analyze."),
+    mode: str = typer.Option("frames", help="Sampling mode: 'frames' (accurate) or 'keyframes' (fast triage, approximate motion)."),
+    workers: int = typer.Option(0, help="Analysis worker threads fed by a separate decoder thread (0 = serial)."),
+    queue_depth: int = typer.Option(8, help="Max decoded frames waiting for analysis when --workers > 0."),
+    cascade: bool = typer.Option(False, help="Score transcript + metadata first; skip or shorten frame decoding when already confident."),
+    cascade_confidence: float = typer.Option(0.75, help="Origin confidence needed from the cheap tier to skip full decoding."),
     out: str = typer.Option(None, help="Optional output JSON file path."),
     debug: bool = typer.Option(False, help="Include debug features in output."),
+    store: str = typer.Option(None, help="Optional feature store directory to append extracted features to."),
+    item_id: str = typer.Option(None, help="Item id used in the feature store (defaults to the video path)."),
 ):
     result = judge(
         video_path=path,
         transcript_path=transcript,
         fps_sample=fps_sample,
         max_frames=max_frames,
+        mode=mode,
+        workers=workers,
+        queue_depth=queue_depth,
+        cascade=cascade,
+        cascade_confidence=cascade_confidence,
         include_debug=debug,
+        feature_store=store,
+        item_id=item_id,
     )
     payload = json.dumps(result.model_dump(), indent=2)
 
@@ -46,3 +63,73 @@ def video(
         Path(out).write_text(payload, encoding="utf-8")
 
     print(payload)
+
+@app.command()
+def rescore(
+    store: str = typer.Option(..., help="Feature store directory written by `text`/`video --store`."),
+    diff: bool = typer.Option(False, help="Include previous scores and per-item deltas."),
+    changed_only: bool = typer.Option(False, help="Only emit items whose label or virality score changed."),
+    save: bool = typer.Option(False, help="Replace stored scores with the new ones."),
+    out: str = typer.Option(None, help="Optional output JSON file path."),
+):
+    records = rescore_store(store, save=save)
+    if changed_only:
+        records = [
+            r for r in records
+            if r["diff"]["origin_label_changed"] or r["diff"]["virality_score_delta"]
+        ]
+    if not diff:
+        records = [{k: v for k, v in r.items() if k not in ("previous", "diff")} for r in records]
+    payload = json.dumps(records, indent=2)
+
+    if out:
+        Path(out).parent.mkdir(parents=True, exist_ok=True)
+        Path(out).write_text(payload, encoding="utf-8")
+
+    print(payload)
+
+@app.command()
+def loadtest(
+    url: str = typer.Option(None, help="Base URL of a running server. If omitted, one is started locally."),
+    server: str = typer.Option("process", help="Local server: 'process' (uvicorn subprocess), 'web' (judge-agent-web subprocess) or 'thread' (in-process)."),
+    server_arg: List[str] = typer.Option(None, help="Extra CLI argument for the --server process/web command, e.g. --server-arg=--workers --server-arg=4 (repeatable)."),
+    text_file: List[str] = typer.Option(None, "--text", help="Text file to upload (repeatable). Defaults to built-in small/large texts."),
+    video_file: List[str] = typer.Option(None, "--video", help="Video file to upload (repeatable); use files of different sizes."),
+    mix: str = typer.Option(None, help="Request mix weights, e.g. 'text=3,video=1'."),
+    concurrency: int = typer.Option(4, help="Closed-loop concurrent clients (ignored with --rate)."),
+    rate: float = typer.Option(None, help="Open-loop arrival rate in requests/s (Poisson)."),
+    duration: float = typer.Option(10.0, help="Test duration in seconds."),
+    requests: int = typer.Option(None, help="Send exactly this many requests instead of running for --duration."),
+    timeout: float = typer.Option(60.0, help="Per-request timeout in seconds."),
+    fps_sample: float = typer.Option(1.0, help="fps_sample form value for video requests."),
+    max_frames: int = typer.Option(60, help="max_frames form value for video requests."),
+    mode: str = typer.Option("frames", help="mode form value for video requests."),
+    seed: int = typer.Option(0, help="Random seed for the request mix and arrivals."),
+    out: str = typer.Option(None, help="Optional output JSON file path."),
+):
+    from judge_agent.loadtest import run_loadtest
+
+    report = run_loadtest(
+        url=url,
+        server=server,
+        server_args=server_arg,
+        texts=text_file,
+        videos=video_file,
+        mix=mix,
+        concurrency=concurrency,
+        rate=rate,
+        duration_s=duration,
+        total_requests=requests,
+        timeout_s=timeout,
+        fps_sample=fps_sample,
+        max_frames=max_frames,
+        mode=mode,
+        seed=seed,
+    )
+    payload = json.dumps(report, indent=2)
+
+    if out:
+        Path(out).parent.mkdir(parents=True, exist_ok=True)
+        Path(out).write_text(payload, encoding="utf-8")
+
+    print(payload)
@@ -1,4 +1,5 @@
 from __future__ import annotations
+import tempfile
 from dataclasses import dataclass
 from typing import Dict, Any, Optional
 from pathlib import Path
@@ -27,18 +28,14 @@ def extract_audio_features(video_path: str, transcript_path: Optional[str] = Non
 
     # We'll assume audio exists if ffmpeg can extract it; if ffmpeg not installed, mark unknown as False.
     has_audio = False
-    tmp = Path(".tmp_audio.wav")
-    try:
-        extract_audio(video_path, str(tmp))
-        has_audio = tmp.exists() and tmp.stat().st_size > 0
-    except Exception:
-        has_audio = False
-    finally:
-        if tmp.exists():
-            try:
-                tmp.unlink()
-            except Exception:
-                pass
+    # Per-call temp dir: concurrent requests/workers must not share the extracted wav.
+    with tempfile.TemporaryDirectory(prefix="judge-audio-") as td:
+        tmp = Path(td) / "audio.wav"
+        try:
+            extract_audio(video_path, str(tmp))
+            has_audio = tmp.exists() and tmp.stat().st_size > 0
+        except Exception:
+            has_audio = False
 
     return AudioFeatures(
         has_audio=has_audio,
@@ -1,9 +1,17 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Dict, Any, List
+from itertools import islice
+import queue
+import threading
+from typing import Dict, Any, Callable, Generator, Iterator, List, Optional, Tuple
 import cv2
 import numpy as np
-from judge_agent.utils.ffmpeg import probe
+from judge_agent.utils.ffmpeg import iter_keyframes_gray, probe
+
+VIDEO_MODES = ("frames", "keyframes")
+
+# Given a buffer provider, returns a generator of gray frames written into provided buffers.
+FrameSource = Callable[[Callable[[Tuple[int, int]], np.ndarray]], Generator[np.ndarray, None, None]]
 
 
 @dataclass
@@ -16,21 +24,171 @@ class VideoFeatures:
     motion_score: float
     sharpness_score: float
     text_overlay_likelihood: float
+    mode: str = "frames"
+    # Keyframes are far apart in time, so frame-to-frame motion is only a rough proxy.
+    approximate_motion: bool = False
+    # Per-frame spread of the raw signals behind the averages above.
+    brightness_var: float = 0.0
+    brightness_min: float = 0.0
+    brightness_max: float = 0.0
+    motion_var: float = 0.0
+    motion_min: float = 0.0
+    motion_max: float = 0.0
+    sharpness_var: float = 0.0
+    sharpness_min: float = 0.0
+    sharpness_max: float = 0.0
+    overlay_edge_var: float = 0.0
+    overlay_edge_min: float = 0.0
+    overlay_edge_max: float = 0.0
 
     def as_dict(self) -> Dict[str, Any]:
         return self.__dict__
 
 
-def _laplacian_variance(gray: np.ndarray) -> float:
-    return float(cv2.Laplacian(gray, cv2.CV_64F).var())
+class _RunningStats:
+    """Welford running mean/variance plus min/max, so per-frame values need not be kept."""
 
+    __slots__ = ("n", "mean", "m2", "min", "max")
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def add(self, x: float) -> None:
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.n if self.n else 0.0
+
+    def summary(self) -> Tuple[float, float, float, float]:
+        if not self.n:
+            return 0.0, 0.0, 0.0, 0.0
+        return self.mean, self.variance, self.min, self.max
+
+
+# (brightness, sharpness, motion vs previous frame or None, overlay edge density)
+_Measurement = Tuple[float, float, Optional[float], float]
+
+
+class _FrameMeasurer:
+    """Per-frame measurements written into preallocated destination buffers."""
+
+    def __init__(self) -> None:
+        self._lap = None
+        self._diff = None
+        self._edges = None
+
+    def _ensure_buffers(self, gray: np.ndarray) -> None:
+        if self._lap is not None and self._lap.shape == gray.shape:
+            return
+        h, w = gray.shape
+        self._lap = np.empty((h, w), dtype=np.float64)
+        self._diff = np.empty((h, w), dtype=np.uint8)
+        self._edges = np.empty((h - int(0.80*h), w), dtype=np.uint8)
+
+    def measure(self, gray: np.ndarray, prev: Optional[np.ndarray]) -> _Measurement:
+        self._ensure_buffers(gray)
+
+        brightness = cv2.mean(gray)[0]
+
+        cv2.Laplacian(gray, cv2.CV_64F, dst=self._lap)
+        _, std = cv2.meanStdDev(self._lap)
+        sharpness = float(std[0, 0]) ** 2
+
+        motion = None
+        if prev is not None and prev.shape == gray.shape:
+            cv2.absdiff(gray, prev, dst=self._diff)
+            motion = cv2.mean(self._diff)[0]
+
+        # crude overlay heuristic: high-contrast edges near bottom/top bands
+        h, w = gray.shape
+        band = gray[int(0.80*h):h, :]
+        cv2.Canny(band, 80, 160, edges=self._edges)
+        overlay = cv2.mean(self._edges)[0] / 255.0
+
+        return brightness, sharpness, motion, overlay
+
+
+class _FrameAnalyzer:
+    """Folds per-frame measurements into running statistics, in frame order."""
+
+    def __init__(self) -> None:
+        self.kept = 0
+        self.brightness = _RunningStats()
+        self.motion = _RunningStats()
+        self.sharpness = _RunningStats()
+        self.overlay = _RunningStats()
+
+    def record(self, m: _Measurement) -> None:
+        brightness, sharpness, motion, overlay = m
+        self.kept += 1
+        self.brightness.add(brightness)
+        self.sharpness.add(sharpness)
+        if motion is not None:
+            self.motion.add(motion)
+        self.overlay.add(overlay)
+
+
+class _AlternatingBuffers:
+    """Two gray buffers used in turn, so the previous frame stays valid while the next is filled."""
+
+    def __init__(self) -> None:
+        self._bufs: Optional[List[np.ndarray]] = None
+        self._slot = 0
+
+    def __call__(self, shape: Tuple[int, int]) -> np.ndarray:
+        if self._bufs is None or self._bufs[0].shape != shape:
+            self._bufs = [np.empty(shape, dtype=np.uint8) for _ in range(2)]
+        buf = self._bufs[self._slot]
+        self._slot ^= 1
+        return buf
 
-def extract_video_features(video_path: str, fps_sample: float = 1.0, max_frames: int = 60) -> VideoFeatures:
-    meta = probe(video_path)
-    duration_s = float(meta.get("duration", 0.0) or 0.0)
-    width = int(meta.get("width", 0) or 0)
-    height = int(meta.get("height", 0) or 0)
 
+class _Stopped(Exception):
+    pass
+
+
+class _BufferPool:
+    """Fixed set of gray buffers shared by the decoder thread and analysis workers."""
+
+    def __init__(self, size: int, stop: threading.Event) -> None:
+        self._size = size
+        self._stop = stop
+        self._shape: Optional[Tuple[int, int]] = None
+        self._free: "queue.Queue[np.ndarray]" = queue.Queue()
+
+    def __call__(self, shape: Tuple[int, int]) -> np.ndarray:
+        if self._shape != shape:
+            self._shape = shape
+            self._free = queue.Queue()
+            for _ in range(self._size):
+                self._free.put(np.empty(shape, dtype=np.uint8))
+        while True:
+            try:
+                return self._free.get(timeout=0.1)
+            except queue.Empty:
+                if self._stop.is_set():
+                    raise _Stopped()
+
+    def release(self, buf: np.ndarray) -> None:
+        if buf.shape == self._shape:
+            self._free.put(buf)
+
+
+def _iter_sampled_gray(
+    video_path: str, fps_sample: float, buffers: Callable[[Tuple[int, int]], np.ndarray]
+) -> Iterator[np.ndarray]:
     cap = cv2.VideoCapture(video_path)
     if not cap.isOpened():
         raise RuntimeError(f"Could not open video: {video_path}")
@@ -38,54 +196,230 @@ def extract_video_features(video_path: str, fps_sample: float = 1.0, max_frames:
     native_fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
     step = max(int(native_fps / fps_sample), 1)
 
-    prev_gray = None
-    motions: List[float] = []
-    brights: List[float] = []
-    sharps: List[float] = []
-    overlays: List[float] = []
-
-    frame_idx = 0
-    kept = 0
-    while kept < max_frames:
-        ok, frame = cap.read()
-        if not ok:
-            break
-        if frame_idx % step != 0:
+    frame = None
+    try:
+        frame_idx = 0
+        while True:
+            if frame_idx % step != 0:
+                # grab() advances without converting the skipped frame into a BGR image
+                if not cap.grab():
+                    break
+                frame_idx += 1
+                continue
+            ok, frame = cap.read(frame)
+            if not ok:
+                break
             frame_idx += 1
-            continue
+            gray = buffers(frame.shape[:2])
+            cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=gray)
+            yield gray
+    finally:
+        cap.release()
 
-        kept += 1
-        frame_idx += 1
 
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        brights.append(float(np.mean(gray)))
-        sharps.append(_laplacian_variance(gray))
+def _iter_keyframe_gray(
+    video_path: str, width: int, height: int, buffers: Callable[[Tuple[int, int]], np.ndarray]
+) -> Iterator[np.ndarray]:
+    yield from iter_keyframes_gray(video_path, width, height, lambda: buffers((height, width)))
 
-        if prev_gray is not None:
-            diff = cv2.absdiff(gray, prev_gray)
-            motions.append(float(np.mean(diff)))
-        prev_gray = gray
 
-        # crude overlay heuristic: high-contrast edges near bottom/top bands
-        h, w = gray.shape
-        band = gray[int(0.80*h):h, :]
-        edges = cv2.Canny(band, 80, 160)
-        overlays.append(float(np.mean(edges)) / 255.0)
+def extract_video_metadata(video_path: str) -> Dict[str, Any]:
+    """Container metadata from ffprobe only; no frames are decoded."""
+    meta = probe(video_path)
+    return {
+        "duration_s": float(meta.get("duration", 0.0) or 0.0),
+        "width": int(meta.get("width", 0) or 0),
+        "height": int(meta.get("height", 0) or 0),
+    }
+
+
+def extract_video_features(
+    video_path: str,
+    fps_sample: float = 1.0,
+    max_frames: int = 60,
+    mode: str = "frames",
+    workers: int = 0,
+    queue_depth: int = 8,
+    meta: Optional[Dict[str, Any]] = None,
+) -> VideoFeatures:
+    """
+    mode="frames" samples decoded frames at fps_sample (frame-accurate).
+    mode="keyframes" decodes only I-frames via ffmpeg for fast triage; fps_sample is ignored
+    and motion is flagged as approximate. Falls back to "frames" if ffmpeg cannot provide keyframes.
+
+    workers > 0 decodes on a separate thread and analyzes frames on that many worker threads,
+    with at most queue_depth decoded frames waiting. Results are identical to workers=0.
+
+    meta is the result of extract_video_metadata, if the caller already probed the file.
+    """
+    if mode not in VIDEO_MODES:
+        raise ValueError(f"mode must be one of {', '.join(VIDEO_MODES)}.")
+    if workers < 0:
+        raise ValueError("workers must be >= 0.")
+    if queue_depth < 1:
+        raise ValueError("queue_depth must be >= 1.")
+
+    def analyze(source: FrameSource) -> _FrameAnalyzer:
+        if workers:
+            return _analyze_pipelined(source, max_frames, workers, queue_depth)
+        return _analyze(source, max_frames)
+
+    if meta is None:
+        meta = extract_video_metadata(video_path)
+    duration_s, width, height = meta["duration_s"], meta["width"], meta["height"]
+
+    if mode == "keyframes" and width and height:
+        try:
+            stats = analyze(lambda buffers: _iter_keyframe_gray(video_path, width, height, buffers))
+        except OSError:
+            stats = None
+        if stats is not None and stats.kept > 0:
+            return _build_features(duration_s, width, height, stats, mode="keyframes")
+
+    stats = analyze(lambda buffers: _iter_sampled_gray(video_path, fps_sample, buffers))
+    return _build_features(duration_s, width, height, stats, mode="frames")
+
+
+def _analyze(source: FrameSource, max_frames: int) -> _FrameAnalyzer:
+    analyzer = _FrameAnalyzer()
+    measurer = _FrameMeasurer()
+    frames = source(_AlternatingBuffers())
+    try:
+        prev = None
+        for gray in islice(frames, max(max_frames, 0)):
+            analyzer.record(measurer.measure(gray, prev))
+            prev = gray
+    finally:
+        frames.close()
+    return analyzer
+
+
+def _analyze_pipelined(source: FrameSource, max_frames: int, workers: int, queue_depth: int) -> _FrameAnalyzer:
+    """
+    Decoder thread -> bounded queue -> analysis worker threads.
+
+    OpenCV releases the GIL, so decoding and analysis overlap. Memory is bounded by the
+    buffer pool (queue_depth + 2 * workers + 2 frames). Measurements are folded in frame
+    order afterwards, so the result matches the serial path exactly.
+    """
+    stop = threading.Event()
+    pool = _BufferPool(queue_depth + 2 * workers + 2, stop)
+    work: "queue.Queue[Optional[Tuple[int, np.ndarray, Optional[np.ndarray]]]]" = queue.Queue(maxsize=queue_depth)
+    results: Dict[int, _Measurement] = {}
+    errors: List[BaseException] = []
+
+    # Each frame buffer is needed by its own measurement and by the next frame's motion diff.
+    refs: Dict[int, List[Any]] = {}
+    refs_lock = threading.Lock()
+
+    def unref(idx: int) -> None:
+        with refs_lock:
+            entry = refs.get(idx)
+            if entry is None:
+                return
+            entry[1] -= 1
+            if entry[1] == 0:
+                del refs[idx]
+                pool.release(entry[0])
+
+    def put(item: Any) -> None:
+        while not stop.is_set():
+            try:
+                work.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+        raise _Stopped()
+
+    def decode() -> None:
+        frames = source(pool)
+        idx = -1
+        try:
+            prev = None
+            for idx, gray in enumerate(islice(frames, max(max_frames, 0))):
+                with refs_lock:
+                    refs[idx] = [gray, 2]
+                put((idx, gray, prev))
+                prev = gray
+        except _Stopped:
+            pass
+        except BaseException as exc:
+            errors.append(exc)
+            stop.set()
+        finally:
+            frames.close()
+            if idx >= 0:
+                unref(idx)
+            for _ in range(workers):
+                try:
+                    put(None)
+                except _Stopped:
+                    break
+
+    def analyze() -> None:
+        measurer = _FrameMeasurer()
+        try:
+            while True:
+                try:
+                    item = work.get(timeout=0.1)
+                except queue.Empty:
+                    if stop.is_set():
+                        return
+                    continue
+                if item is None:
+                    return
+                idx, gray, prev = item
+                results[idx] = measurer.measure(gray, prev)
+                unref(idx)
+                if prev is not None:
+                    unref(idx - 1)
+        except BaseException as exc:
+            errors.append(exc)
+            stop.set()
+
+    threads = [threading.Thread(target=decode, name="judge-decode", daemon=True)]
+    threads += [threading.Thread(target=analyze, name=f"judge-analyze-{i}", daemon=True) for i in range(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    if errors:
+        raise errors[0]
+
+    analyzer = _FrameAnalyzer()
+    for idx in sorted(results):
+        analyzer.record(results[idx])
+    return analyzer
 
-    cap.release()
 
-    avg_brightness = float(np.mean(brights)) if brights else 0.0
-    motion_score = float(np.mean(motions)) if motions else 0.0
-    sharpness_score = float(np.mean(sharps)) if sharps else 0.0
-    text_overlay_likelihood = float(np.clip(np.mean(overlays) * 5.0, 0.0, 1.0)) if overlays else 0.0
+def _build_features(duration_s: float, width: int, height: int, stats: _FrameAnalyzer, mode: str) -> VideoFeatures:
+    avg_brightness, brightness_var, brightness_min, brightness_max = stats.brightness.summary()
+    motion_score, motion_var, motion_min, motion_max = stats.motion.summary()
+    sharpness_score, sharpness_var, sharpness_min, sharpness_max = stats.sharpness.summary()
+    overlay_mean, overlay_var, overlay_min, overlay_max = stats.overlay.summary()
+    text_overlay_likelihood = float(np.clip(overlay_mean * 5.0, 0.0, 1.0)) if stats.overlay.n else 0.0
 
     return VideoFeatures(
         duration_s=duration_s,
         width=width,
         height=height,
-        sampled_frames=kept,
+        sampled_frames=stats.kept,
         avg_brightness=avg_brightness,
         motion_score=motion_score,
         sharpness_score=sharpness_score,
         text_overlay_likelihood=text_overlay_likelihood,
+        mode=mode,
+        approximate_motion=(mode == "keyframes"),
+        brightness_var=brightness_var,
+        brightness_min=brightness_min,
+        brightness_max=brightness_max,
+        motion_var=motion_var,
+        motion_min=motion_min,
+        motion_max=motion_max,
+        sharpness_var=sharpness_var,
+        sharpness_min=sharpness_min,
+        sharpness_max=sharpness_max,
+        overlay_edge_var=overlay_var,
+        overlay_edge_min=overlay_min,
+        overlay_edge_max=overlay_max,
     )
@@ -0,0 +1,303 @@
+from __future__ import annotations
+import math
+import os
+import re
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: only in-process locking
+    fcntl = None
+
+from judge_agent.schemas import JudgeOutput
+
+# One .npy file per column per segment. Feature columns are named "<group>.<field>", e.g. "video.motion_score".
+SEGMENT_PREFIX = "seg-"
+_SEGMENT_RE = re.compile(r"^seg-(\d+)-(\d+)\.(\d+)$")
+MERGE_FANOUT = 16
+# Safety valve if unevenly sized batch appends keep the tiers from lining up.
+MAX_SEGMENTS = 256
+ID_COLUMN = "_id"
+PRESENT_PREFIX = "_present."
+SCORE_PREFIX = "_score."
+SCORE_FIELDS = ("origin_label", "origin_confidence", "virality_score")
+FEATURE_GROUPS = ("text", "video", "audio", "transcript_text")
+
+LOCK_FILE = ".lock"
+
+# Serializes writers within a process; the flock on LOCK_FILE serializes writer processes.
+_write_lock = threading.Lock()
+
+
+@contextmanager
+def _nullcontext() -> Iterator[None]:
+    yield
+
+
+def _default_for(dtype: np.dtype) -> Any:
+    if dtype.kind == "b":
+        return False
+    if dtype.kind in "iu":
+        return 0
+    if dtype.kind == "f":
+        return np.nan
+    return ""
+
+
+class _Segment(NamedTuple):
+    first: int
+    last: int
+    generation: int
+    path: Path
+
+    def covers(self, other: "_Segment") -> bool:
+        if self.first > other.first or other.last > self.last:
+            return False
+        return (self.last - self.first) > (other.last - other.first) or self.generation > other.generation
+
+
+def _segment_rows(seg: _Segment) -> int:
+    # Reads only the .npy header.
+    with open(seg.path / f"{ID_COLUMN}.npy", "rb") as fh:
+        major, _ = np.lib.format.read_magic(fh)
+        read_header = np.lib.format.read_array_header_1_0 if major == 1 else np.lib.format.read_array_header_2_0
+        shape, _, _ = read_header(fh)
+    return int(shape[0])
+
+
+def _size_class(rows: int) -> int:
+    return int(math.log(max(rows, 1), MERGE_FANOUT))
+
+
+def _column_values(values: List[Any], like: Optional[np.dtype] = None) -> np.ndarray:
+    if like is not None:
+        values = [_default_for(like) if v is None else v for v in values]
+    return np.asarray(values)
+
+
+class FeatureStore:
+    """
+    Append-only columnar store for extracted features and the scores they produced.
+
+    Layout is a directory of segments, each holding one NumPy file per column (<column>.npy).
+    An append writes only its own rows as a new segment and publishes it with an atomic directory
+    rename. Segments are merged size-tiered: once MERGE_FANOUT consecutive trailing segments share
+    a size class they are rewritten as one. Each row is therefore rewritten O(log n) times and the
+    segment count stays O(MERGE_FANOUT * log n), instead of every append rewriting every column.
+
+    Reads of a single segment are memory-mapped; with several segments the columns are read and
+    concatenated in memory. compact() merges everything into one segment (`rescore --save`
+    does this too), which keeps large corpora memory-mapped.
+
+    Segment directories are named seg-<first>-<last>.<generation>, where first..last is the range of
+    appends they contain. A merge writes the new segment before deleting the ones it covers, and
+    readers ignore covered segments, so an interrupted merge never duplicates or loses rows.
+    Writers (any process) are serialized with an flock on <store>/.lock; readers take it shared.
+    """
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    @contextmanager
+    def _locked(self, exclusive: bool = True) -> Iterator[None]:
+        with _write_lock if exclusive else _nullcontext():
+            if fcntl is None:
+                yield
+                return
+            self.root.mkdir(parents=True, exist_ok=True)
+            with open(self.root / LOCK_FILE, "a+b") as fh:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+    def _all_segments(self) -> List[_Segment]:
+        if not self.root.exists():
+            return []
+        segs = []
+        for p in self.root.iterdir():
+            m = _SEGMENT_RE.match(p.name)
+            if m and p.is_dir():
+                segs.append(_Segment(int(m.group(1)), int(m.group(2)), int(m.group(3)), p))
+        return segs
+
+    def _segments(self) -> List[_Segment]:
+        """Live segments in append order (segments covered by a later merge are skipped)."""
+        segs = self._all_segments()
+        return sorted(
+            (s for s in segs if not any(o is not s and o.covers(s) for o in segs)),
+            key=lambda s: s.first,
+        )
+
+    def _write_segment(self, cols: Dict[str, np.ndarray], first: int, last: int, generation: int) -> None:
+        tmp = Path(tempfile.mkdtemp(dir=self.root, prefix="." + SEGMENT_PREFIX))
+        try:
+            for column, arr in cols.items():
+                np.save(tmp / f"{column}.npy", arr)
+            os.rename(tmp, self.root / f"{SEGMENT_PREFIX}{first:012d}-{last:012d}.{generation}")
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+    def _read_segments(self, segs: List[_Segment], mmap: bool) -> Dict[str, np.ndarray]:
+        # Only a lone segment is memory-mapped: each memmap holds a file descriptor.
+        mode = "r" if mmap and len(segs) == 1 else None
+        parts: List[Tuple[int, Dict[str, np.ndarray]]] = []
+        for seg in segs:
+            cols = {p.name[: -len(".npy")]: np.load(p, mmap_mode=mode) for p in seg.path.glob("*.npy")}
+            if ID_COLUMN in cols:
+                parts.append((len(cols[ID_COLUMN]), cols))
+        if len(parts) == 1:
+            return parts[0][1]
+
+        dtypes: Dict[str, np.dtype] = {}
+        for _, cols in parts:
+            for column, arr in cols.items():
+                dtypes.setdefault(column, arr.dtype)
+        out: Dict[str, np.ndarray] = {}
+        for column, dtype in dtypes.items():
+            chunks = [
+                cols[column] if column in cols else np.full(n, _default_for(dtype), dtype=dtype)
+                for n, cols in parts
+            ]
+            out[column] = np.concatenate(chunks)
+        return out
+
+    def _merge(self, segs: List[_Segment], overrides: Optional[Dict[str, np.ndarray]] = None) -> None:
+        cols = self._read_segments(segs, mmap=False)
+        n = len(cols.get(ID_COLUMN, ()))
+        for column, arr in (overrides or {}).items():
+            if len(arr) != n:
+                raise ValueError(f"Expected {n} values for {column}, got {len(arr)}.")
+            cols[column] = arr
+        generation = max(s.generation for s in self._all_segments()) + 1
+        self._write_segment(cols, segs[0].first, segs[-1].last, generation)
+        self._drop_covered()
+
+    def _drop_covered(self) -> None:
+        live = {s.path for s in self._segments()}
+        for seg in self._all_segments():
+            if seg.path not in live:
+                shutil.rmtree(seg.path, ignore_errors=True)
+
+    def _merge_tail(self) -> None:
+        segs = self._segments()
+        if len(segs) > MAX_SEGMENTS:
+            self._merge(segs)
+            return
+        while len(segs) >= MERGE_FANOUT:
+            tail = segs[-MERGE_FANOUT:]
+            classes = {_size_class(_segment_rows(s)) for s in tail}
+            if len(classes) != 1:
+                return
+            self._merge(tail)
+            segs = self._segments()
+
+    def columns(self) -> List[str]:
+        return sorted(self.load())
+
+    def __len__(self) -> int:
+        if not self.root.exists():
+            return 0
+        with self._locked(exclusive=False):
+            return sum(_segment_rows(s) for s in self._segments())
+
+    def load(self, mmap: bool = True) -> Dict[str, np.ndarray]:
+        if not self.root.exists():
+            return {}
+        with self._locked(exclusive=False):
+            return self._read_segments(self._segments(), mmap)
+
+    def append(self, item_id: str, features: Dict[str, Any], output: JudgeOutput) -> None:
+        self.append_many([(item_id, features, output)])
+
+    def append_many(self, rows: List[Tuple[str, Dict[str, Any], JudgeOutput]]) -> None:
+        if not rows:
+            return
+
+        new: Dict[str, List[Any]] = {}
+
+        def put(column: str, i: int, value: Any) -> None:
+            col = new.get(column)
+            if col is None:
+                col = new[column] = [None] * len(rows)
+            col[i] = value
+
+        for i, (item_id, features, output) in enumerate(rows):
+            put(ID_COLUMN, i, str(item_id))
+            for group in FEATURE_GROUPS:
+                put(PRESENT_PREFIX + group, i, group in features)
+                for field, value in (features.get(group) or {}).items():
+                    put(f"{group}.{field}", i, value)
+            put(SCORE_PREFIX + "origin_label", i, output.origin_prediction.label)
+            put(SCORE_PREFIX + "origin_confidence", i, float(output.origin_prediction.confidence))
+            put(SCORE_PREFIX + "virality_score", i, int(output.virality_score))
+
+        cols: Dict[str, np.ndarray] = {}
+        for column, values in new.items():
+            dtype = _column_values([v for v in values if v is not None]).dtype
+            cols[column] = _column_values(values, like=dtype)
+
+        with self._locked():
+            segs = self._all_segments()
+            seq = max((s.last for s in segs), default=0) + 1
+            self._write_segment(cols, seq, seq, 0)
+            self._merge_tail()
+
+    def compact(self) -> None:
+        """Merges all segments into one, so later reads are a single memory-mapped segment."""
+        with self._locked():
+            segs = self._segments()
+            if len(segs) > 1:
+                self._merge(segs)
+
+    def write_scores(self, outputs: List[JudgeOutput]) -> None:
+        """Overwrite the stored score columns (compacting the store), e.g. after a rescore with retuned weights."""
+        overrides = {
+            SCORE_PREFIX + "origin_label": np.asarray([o.origin_prediction.label for o in outputs]),
+            SCORE_PREFIX + "origin_confidence": np.asarray(
+                [float(o.origin_prediction.confidence) for o in outputs], dtype=np.float64
+            ),
+            SCORE_PREFIX + "virality_score": np.asarray([int(o.virality_score) for o in outputs], dtype=np.int64),
+        }
+        with self._locked():
+            segs = self._segments()
+            if not segs:
+                raise ValueError(f"Expected 0 outputs, got {len(outputs)}.")
+            self._merge(segs, overrides)
+
+    def iter_items(self) -> Iterator[Tuple[str, Dict[str, Any], Dict[str, Any]]]:
+        """Yields (item_id, features, previous_scores) rebuilt from the column files."""
+        cols = self.load(mmap=True)
+        if ID_COLUMN not in cols:
+            return
+
+        grouped: Dict[str, List[Tuple[str, np.ndarray]]] = {g: [] for g in FEATURE_GROUPS}
+        for column, arr in cols.items():
+            group, _, field = column.partition(".")
+            if group in grouped and field:
+                grouped[group].append((field, arr))
+
+        for i, item_id in enumerate(cols[ID_COLUMN]):
+            features: Dict[str, Any] = {}
+            for group, fields in grouped.items():
+                present = cols.get(PRESENT_PREFIX + group)
+                if present is None or not bool(present[i]):
+                    continue
+                # NaN marks a float feature the item did not have (e.g. frames skipped by a cascade)
+                values = {field: arr[i].item() for field, arr in fields}
+                features[group] = {k: v for k, v in values.items() if not (isinstance(v, float) and np.isnan(v))}
+            previous = {
+                f: cols[SCORE_PREFIX + f][i].item()
+                for f in SCORE_FIELDS
+                if SCORE_PREFIX + f in cols
+            }
+            yield str(item_id), features, previous
@@ -0,0 +1,419 @@
+from __future__ import annotations
+import asyncio
+import importlib.metadata
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import numpy as np
+
+_SAMPLE_SENTENCE = (
+    "Here are three quick ways to keep your focus during a long workday, and why they help. "
+)
+# Built-in text payloads (name, approx. words) used when no --text files are given.
+_BUILTIN_TEXT_SIZES = (("text-small", 60), ("text-large", 3000))
+
+
+@dataclass
+class LoadRequest:
+    kind: str
+    name: str
+    body: bytes
+    content_type: str
+
+
+@dataclass
+class Sample:
+    kind: str
+    name: str
+    start: float
+    latency_s: float
+    status: int
+    error: Optional[str] = None
+
+
+def _multipart(fields: Dict[str, str], filename: str, payload: bytes) -> Tuple[bytes, str]:
+    boundary = uuid.uuid4().hex
+    parts: List[bytes] = []
+    for k, v in fields.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{k}"\r\n\r\n{v}\r\n'.encode("utf-8")
+        )
+    parts.append(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f"Content-Type: application/octet-stream\r\n\r\n".encode("utf-8")
+    )
+    parts.append(payload)
+    parts.append(f"\r\n--{boundary}--\r\n".encode("utf-8"))
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+def build_requests(
+    texts: List[str],
+    videos: List[str],
+    fps_sample: float = 1.0,
+    max_frames: int = 60,
+    mode: str = "frames",
+) -> Dict[str, List[LoadRequest]]:
+    """Pre-encodes one request body per input so the client loop does no file I/O."""
+    out: Dict[str, List[LoadRequest]] = {"text": [], "video": []}
+    common = {"fps_sample": str(fps_sample), "max_frames": str(max_frames), "mode": mode, "debug": "false"}
+
+    text_inputs: List[Tuple[str, bytes]] = []
+    if texts:
+        text_inputs = [(Path(p).name, Path(p).read_bytes()) for p in texts]
+    else:
+        n_words = len(_SAMPLE_SENTENCE.split())
+        for name, words in _BUILTIN_TEXT_SIZES:
+            reps = max(words // n_words, 1)
+            text_inputs.append((f"{name}.txt", (_SAMPLE_SENTENCE * reps).encode("utf-8")))
+
+    for name, payload in text_inputs:
+        body, ctype = _multipart(dict(common, content_type="text"), name, payload)
+        out["text"].append(LoadRequest("text", name, body, ctype))
+
+    for p in videos:
+        name = Path(p).name
+        body, ctype = _multipart(dict(common, content_type="video"), name, Path(p).read_bytes())
+        out["video"].append(LoadRequest("video", name, body, ctype))
+
+    return out
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """Parses "text=3,video=1" into normalized weights."""
+    weights: Dict[str, float] = {}
+    for part in mix.split(","):
+        if not part.strip():
+            continue
+        kind, _, w = part.partition("=")
+        kind = kind.strip()
+        if kind not in ("text", "video"):
+            raise ValueError(f"Unknown request kind in mix: {kind!r} (expected 'text' or 'video').")
+        weights[kind] = float(w) if w.strip() else 1.0
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("Request mix weights must sum to more than 0.")
+    return {k: v / total for k, v in weights.items() if v > 0}
+
+
+async def _send(host: str, port: int, path: str, req: LoadRequest, timeout: float) -> int:
+    async def go() -> int:
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            head = (
+                f"POST {path} HTTP/1.1\r\nHost: {host}:{port}\r\n"
+                f"Content-Type: {req.content_type}\r\nContent-Length: {len(req.body)}\r\n"
+                "Connection: close\r\n\r\n"
+            ).encode("latin-1")
+            writer.write(head)
+            writer.write(req.body)
+            await writer.drain()
+            status_line = await reader.readline()
+            await reader.read()
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+        parts = status_line.split()
+        if len(parts) < 2 or not parts[1].isdigit():
+            raise ConnectionError("Malformed HTTP response.")
+        return int(parts[1])
+
+    return await asyncio.wait_for(go(), timeout)
+
+
+async def _run(
+    url: str,
+    requests: Dict[str, List[LoadRequest]],
+    mix: Dict[str, float],
+    concurrency: int,
+    rate: Optional[float],
+    duration_s: float,
+    total_requests: Optional[int],
+    timeout_s: float,
+    seed: int,
+) -> Tuple[List[Sample], float]:
+    parts = urlsplit(url)
+    host, port = parts.hostname or "127.0.0.1", parts.port or 80
+    path = (parts.path.rstrip("/") or "") + "/judge"
+
+    rng = random.Random(seed)
+    kinds = list(mix)
+    weights = [mix[k] for k in kinds]
+    samples: List[Sample] = []
+
+    def pick() -> LoadRequest:
+        kind = rng.choices(kinds, weights)[0]
+        return rng.choice(requests[kind])
+
+    async def one(req: LoadRequest, scheduled: float) -> None:
+        # Latency is measured from the scheduled start, so queueing delay counts (open loop).
+        status, error = 0, None
+        try:
+            status = await _send(host, port, path, req, timeout_s)
+        except asyncio.TimeoutError:
+            error = "timeout"
+        except OSError as exc:
+            error = type(exc).__name__
+        samples.append(Sample(req.kind, req.name, scheduled - t0, time.perf_counter() - scheduled, status, error))
+
+    t0 = time.perf_counter()
+    deadline = t0 + duration_s
+
+    def more(issued: int) -> bool:
+        if total_requests is not None:
+            return issued < total_requests
+        return time.perf_counter() < deadline
+
+    issued = 0
+    if rate:
+        # Open loop: Poisson arrivals independent of response times.
+        tasks = []
+        next_at = t0
+        while more(issued):
+            next_at += rng.expovariate(rate)
+            delay = next_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if total_requests is None and next_at >= deadline:
+                break
+            tasks.append(asyncio.ensure_future(one(pick(), next_at)))
+            issued += 1
+        await asyncio.gather(*tasks)
+    else:
+        # Closed loop: `concurrency` clients, each sending its next request when the last returns.
+        lock = asyncio.Lock()
+
+        async def client() -> None:
+            nonlocal issued
+            while True:
+                async with lock:
+                    if not more(issued):
+                        return
+                    issued += 1
+                await one(pick(), time.perf_counter())
+
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+
+    return samples, time.perf_counter() - t0
+
+
+def _latency_stats(latencies: List[float]) -> Dict[str, Any]:
+    if not latencies:
+        return {"count": 0}
+    arr = np.asarray(latencies) * 1000.0
+    p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+    return {
+        "count": int(arr.size),
+        "mean_ms": round(float(arr.mean()), 2),
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "p99_ms": round(float(p99), 2),
+        "max_ms": round(float(arr.max()), 2),
+    }
+
+
+def summarize(samples: List[Sample], elapsed_s: float) -> Dict[str, Any]:
+    def block(subset: List[Sample]) -> Dict[str, Any]:
+        ok = [s for s in subset if s.error is None and 200 <= s.status < 400]
+        statuses: Dict[str, int] = {}
+        for s in subset:
+            key = s.error or str(s.status)
+            statuses[key] = statuses.get(key, 0) + 1
+        return {
+            "requests": len(subset),
+            "errors": len(subset) - len(ok),
+            "error_rate": round((len(subset) - len(ok)) / len(subset), 4) if subset else 0.0,
+            "throughput_rps": round(len(ok) / elapsed_s, 2) if elapsed_s > 0 else 0.0,
+            "latency": _latency_stats([s.latency_s for s in ok]),
+            "statuses": statuses,
+        }
+
+    summary = block(samples)
+    summary["elapsed_s"] = round(elapsed_s, 3)
+    summary["by_kind"] = {k: block([s for s in samples if s.kind == k]) for k in sorted({s.kind for s in samples})}
+    summary["by_input"] = {n: block([s for s in samples if s.name == n]) for n in sorted({s.name for s in samples})}
+    return summary
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port: int, timeout_s: float, proc: Optional[subprocess.Popen] = None) -> None:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if proc is not None and proc.poll() is not None:
+            raise RuntimeError(f"Server exited with code {proc.returncode} before accepting connections.")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Server did not start on port {port} within {timeout_s:.0f}s.")
+
+
+@contextmanager
+def local_server(server: str = "process", server_args: Optional[List[str]] = None) -> Iterator[str]:
+    """
+    Starts judge_agent.web:app on a free localhost port and yields its base URL.
+
+    server="process" runs plain uvicorn in a subprocess (extra uvicorn CLI flags go in server_args).
+    server="web" runs the judge-agent-web entry point in a subprocess, so production settings such as
+    ["--workers", "4", "--max-requests", "500"] can be passed in server_args and measured.
+    server="thread" runs it in this process, which is convenient but shares the GIL with the load
+    generator and so understates capacity.
+    """
+    import uvicorn
+
+    port = _free_port()
+    if server in ("process", "web"):
+        if server == "process":
+            cmd = [sys.executable, "-m", "uvicorn", "judge_agent.web:app"]
+        else:
+            cmd = [sys.executable, "-m", "judge_agent.web"]
+        cmd += ["--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", *(server_args or [])]
+        proc = subprocess.Popen(cmd)
+        try:
+            _wait_for_port(port, 30.0, proc)
+            yield f"http://127.0.0.1:{port}"
+        finally:
+            proc.terminate()
+            try:
+                proc.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+    elif server == "thread":
+        config = uvicorn.Config("judge_agent.web:app", host="127.0.0.1", port=port, log_level="warning")
+        srv = uvicorn.Server(config)
+        t = threading.Thread(target=srv.run, name="judge-loadtest-server", daemon=True)
+        t.start()
+        try:
+            _wait_for_port(port, 30.0)
+            yield f"http://127.0.0.1:{port}"
+        finally:
+            srv.should_exit = True
+            t.join(timeout=10)
+    else:
+        raise ValueError("server must be 'process', 'web' or 'thread'.")
+
+
+def _git_revision() -> Optional[str]:
+    """
+    HEAD of the judge-agent checkout this package is imported from, or None.
+
+    Only a source checkout (src/judge_agent inside the git work tree root) counts: an installed
+    copy may sit inside some other repository (e.g. a project venv), whose HEAD says nothing
+    about the code under test.
+    """
+    package_dir = Path(__file__).resolve().parent
+    if package_dir.parent.name != "src":
+        return None
+    checkout = package_dir.parent.parent
+    try:
+        p = subprocess.run(
+            ["git", "rev-parse", "--show-toplevel", "HEAD"],
+            cwd=package_dir,
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+        )
+    except OSError:
+        return None
+    lines = p.stdout.split()
+    if p.returncode != 0 or len(lines) != 2 or Path(lines[0]).resolve() != checkout:
+        return None
+    return lines[1]
+
+
+def _package_version() -> Optional[str]:
+    try:
+        return importlib.metadata.version("judge-agent")
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def run_loadtest(
+    url: Optional[str] = None,
+    server: str = "process",
+    server_args: Optional[List[str]] = None,
+    texts: Optional[List[str]] = None,
+    videos: Optional[List[str]] = None,
+    mix: Optional[str] = None,
+    concurrency: int = 4,
+    rate: Optional[float] = None,
+    duration_s: float = 10.0,
+    total_requests: Optional[int] = None,
+    timeout_s: float = 60.0,
+    fps_sample: float = 1.0,
+    max_frames: int = 60,
+    mode: str = "frames",
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Drives the /judge endpoint and returns a JSON-serializable report.
+
+    Closed loop (default): `concurrency` clients send back-to-back requests.
+    Open loop (rate set): Poisson arrivals at `rate` requests/s regardless of response times.
+    Runs for `duration_s` seconds, or exactly `total_requests` requests if given.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be >= 1.")
+    if rate is not None and rate <= 0:
+        raise ValueError("rate must be greater than 0.")
+
+    requests = build_requests(texts or [], videos or [], fps_sample=fps_sample, max_frames=max_frames, mode=mode)
+    weights = parse_mix(mix or ("text=1,video=1" if requests["video"] else "text=1"))
+    for kind in weights:
+        if not requests[kind]:
+            raise ValueError(f"Request mix includes '{kind}' but no {kind} inputs were given.")
+
+    def go(target: str) -> Tuple[List[Sample], float]:
+        return asyncio.run(
+            _run(target, requests, weights, concurrency, rate, duration_s, total_requests, timeout_s, seed)
+        )
+
+    started_at = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+    if url:
+        target = url
+        samples, elapsed = go(url)
+    else:
+        with local_server(server, server_args) as target:
+            samples, elapsed = go(target)
+
+    return {
+        "config": {
+            "url": url,
+            "server": None if url else server,
+            "server_args": server_args or [],
+            "mix": weights,
+            "inputs": {k: [r.name for r in v] for k, v in requests.items()},
+            "concurrency": None if rate else concurrency,
+            "rate_rps": rate,
+            "duration_s": None if total_requests is not None else duration_s,
+            "total_requests": total_requests,
+            "timeout_s": timeout_s,
+            "fps_sample": fps_sample,
+            "max_frames": max_frames,
+            "mode": mode,
+            "seed": seed,
+        },
+        "revision": _git_revision(),
+        "version": _package_version(),
+        "started_at": started_at,
+        "target": target,
+        "results": summarize(samples, elapsed),
+    }
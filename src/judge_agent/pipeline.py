@@ -1,9 +1,10 @@
 from __future__ import annotations
-from typing import Optional, Dict, Any
+import hashlib
+from typing import Optional, Dict, Any, List
 
 from judge_agent.schemas import JudgeOutput, OriginPrediction, AudienceSegment
 from judge_agent.scorers.origin_scorer import score_origin
-from judge_agent.scorers.virality_scorer import score_virality
+from judge_agent.scorers.virality_scorer import score_virality, virality_bucket
 from judge_agent.scorers.audience_scorer import score_audiences
 
 
@@ -13,7 +14,14 @@ def judge(
     transcript_path: Optional[str] = None,
     fps_sample: float = 1.0,
     max_frames: int = 60,
+    mode: str = "frames",
+    workers: int = 0,
+    queue_depth: int = 8,
+    cascade: bool = False,
+    cascade_confidence: float = 0.75,
     include_debug: bool = False,
+    feature_store: Optional[str] = None,
+    item_id: Optional[str] = None,
 ) -> JudgeOutput:
     from judge_agent.feature_extractors.text_features import extract_text_features
 
@@ -23,41 +31,198 @@ def judge(
         tf = extract_text_features(text)
         features["text"] = tf.as_dict()
 
+    cascade_info: Optional[Dict[str, Any]] = None
+
     if video_path is not None:
-        from judge_agent.feature_extractors.video_features import extract_video_features
+        from judge_agent.feature_extractors.video_features import extract_video_features, extract_video_metadata
         from judge_agent.feature_extractors.audio_features import extract_audio_features
 
-        vf = extract_video_features(video_path, fps_sample=fps_sample, max_frames=max_frames)
-        features["video"] = vf.as_dict()
-        af = extract_audio_features(video_path, transcript_path=transcript_path)
-        features["audio"] = af.as_dict()
-
         # If transcript exists, also run text features on it as additional signal
+        transcript_features = None
         if transcript_path:
             try:
                 transcript = open(transcript_path, "r", encoding="utf-8", errors="ignore").read()
-                features["transcript_text"] = extract_text_features(transcript).as_dict()
+                transcript_features = extract_text_features(transcript).as_dict()
             except Exception:
                 pass
 
+        frame_mode: Optional[str] = mode
+        meta: Optional[Dict[str, Any]] = None
+        if cascade:
+            meta = extract_video_metadata(video_path)
+            cheap: Dict[str, Any] = dict(features)
+            cheap["video"] = dict(meta, sampled_frames=0)
+            if transcript_features is not None:
+                cheap["transcript_text"] = transcript_features
+            frame_mode, cascade_info = _cascade_plan(cheap, mode, cascade_confidence)
+            if transcript_features is not None:
+                cascade_info["tiers_run"].append("transcript")
+
+        if frame_mode is None:
+            features["video"] = cheap["video"]
+            cascade_info["tiers_skipped"] += ["frames", "audio"]
+        else:
+            vf = extract_video_features(
+                video_path,
+                fps_sample=fps_sample,
+                max_frames=max_frames,
+                mode=frame_mode,
+                workers=workers,
+                queue_depth=queue_depth,
+                meta=meta,
+            )
+            features["video"] = vf.as_dict()
+            af = extract_audio_features(video_path, transcript_path=transcript_path)
+            features["audio"] = af.as_dict()
+            if cascade_info is not None:
+                cascade_info["tiers_run"] += [vf.mode, "audio"]
+                if vf.mode != mode:
+                    cascade_info["tiers_skipped"].append(mode)
+
+        if transcript_features is not None:
+            features["transcript_text"] = transcript_features
+
+    out = score_features(features, include_debug=include_debug)
+    out.cascade = cascade_info
+
+    if feature_store:
+        from judge_agent.feature_store import FeatureStore
+
+        if item_id is None:
+            item_id = video_path or hashlib.sha1((text or "").encode("utf-8")).hexdigest()[:16]
+        FeatureStore(feature_store).append(item_id, features, out)
+
+    return out
+
+
+def _scoring_view(features: Dict[str, Any]) -> Dict[str, Any]:
     # Combine transcript text into scoring by treating it as text if main text missing
     scoring_features = dict(features)
     if "text" not in scoring_features and "transcript_text" in scoring_features:
         scoring_features["text"] = scoring_features["transcript_text"]
+    return scoring_features
+
+
+# Extreme frame signals, used to bound what a full decode could still change.
+_VIRALITY_FRAMES_LOW = {"motion_score": 0.0, "sharpness_score": 0.0, "text_overlay_likelihood": 0.0, "avg_brightness": 0.0}
+_VIRALITY_FRAMES_HIGH = {"motion_score": 255.0, "sharpness_score": 0.0, "text_overlay_likelihood": 1.0, "avg_brightness": 255.0}
+_ORIGIN_FRAMES_HUMANLIKE = {"motion_score": 255.0, "sharpness_score": 0.0, "text_overlay_likelihood": 0.0}
+_ORIGIN_FRAMES_AILIKE = {"motion_score": 0.0, "sharpness_score": 1e6, "text_overlay_likelihood": 1.0}
+
+
+def _with_frames(scoring: Dict[str, Any], frame_signals: Dict[str, float]) -> Dict[str, Any]:
+    return dict(scoring, video=dict(scoring["video"], **frame_signals))
+
+
+def _cascade_plan(cheap: Dict[str, Any], mode: str, min_confidence: float):
+    """
+    Scores the cheap tier (text/transcript + ffprobe metadata) and picks how much decoding to do.
+
+    Returns (frame_mode, info): frame_mode is None to skip frame decoding, "keyframes" to shorten it,
+    or the requested mode for a full decode.
+      - origin decided: cheap confidence >= min_confidence and the label holds for both the most
+        human-like and the most AI-like frame signals
+      - virality decided: the bucket is the same at both extremes of the frame signals
+      - both decided => skip frames (and audio); only origin decided => keyframes; else full decode
+    """
+    scoring = _scoring_view(cheap)
+    origin_label, origin_conf, _ = score_origin(scoring)
+    label_humanlike, _, _ = score_origin(_with_frames(scoring, _ORIGIN_FRAMES_HUMANLIKE))
+    label_ailike, _, _ = score_origin(_with_frames(scoring, _ORIGIN_FRAMES_AILIKE))
+    v_low, _ = score_virality(_with_frames(scoring, _VIRALITY_FRAMES_LOW))
+    v_high, _ = score_virality(_with_frames(scoring, _VIRALITY_FRAMES_HIGH))
+
+    origin_decided = origin_conf >= min_confidence and label_humanlike == label_ailike == origin_label
+    virality_decided = virality_bucket(v_low) == virality_bucket(v_high)
+
+    if origin_decided and virality_decided:
+        frame_mode = None
+    elif origin_decided:
+        frame_mode = "keyframes"
+    else:
+        frame_mode = mode
+
+    info = {
+        "tiers_run": ["metadata"],
+        "tiers_skipped": [],
+        "min_confidence": min_confidence,
+        "cheap_origin_confidence": round(origin_conf, 3),
+        "cheap_virality_bounds": [v_low, v_high],
+    }
+    return frame_mode, info
+
+
+def score_features(features: Dict[str, Any], include_debug: bool = False) -> JudgeOutput:
+    """Applies the scorers to already-extracted features (no media access)."""
+    scoring_features = _scoring_view(features)
 
     origin_label, origin_conf, origin_expl = score_origin(scoring_features)
     virality, virality_expl = score_virality(scoring_features)
     audiences, audience_expl = score_audiences(scoring_features)
 
+    explanations = {
+        "origin_prediction": origin_expl,
+        "virality_score": virality_expl,
+        "distribution_analysis": audience_expl,
+    }
+    if features.get("video", {}).get("approximate_motion"):
+        explanations["video_sampling"] = (
+            "Keyframe-only triage: motion is estimated between I-frames and is approximate."
+        )
+
     out = JudgeOutput(
         origin_prediction=OriginPrediction(label=origin_label, confidence=origin_conf),
         virality_score=virality,
         distribution_analysis=[AudienceSegment(**a) for a in audiences],
-        explanations={
-            "origin_prediction": origin_expl,
-            "virality_score": virality_expl,
-            "distribution_analysis": audience_expl,
-        },
+        explanations=explanations,
         debug=features if include_debug else None,
     )
     return out
+
+
+def rescore(feature_store: str, save: bool = False) -> List[Dict[str, Any]]:
+    """
+    Re-applies the current scorers to every item in a feature store.
+
+    Returns one record per item with the new scores, the scores stored at append time,
+    and their differences. With save=True the new scores replace the stored ones.
+    """
+    from judge_agent.feature_store import FeatureStore
+
+    store = FeatureStore(feature_store)
+    records: List[Dict[str, Any]] = []
+    outputs: List[JudgeOutput] = []
+
+    for item_id, features, previous in store.iter_items():
+        out = score_features(features)
+        outputs.append(out)
+
+        new_label = out.origin_prediction.label
+        new_conf = float(out.origin_prediction.confidence)
+        prev_conf = previous.get("origin_confidence")
+        if prev_conf is not None:
+            previous["origin_confidence"] = round(float(prev_conf), 3)
+        prev_virality = previous.get("virality_score")
+        conf_delta = None
+        if prev_conf is not None:
+            conf_delta = round(new_conf - float(prev_conf), 3)
+            # Rounding a tiny negative difference gives -0.0; report an unchanged confidence as 0.0.
+            conf_delta = 0.0 if conf_delta == 0 else conf_delta
+        records.append({
+            "item_id": item_id,
+            "origin_prediction": {"label": new_label, "confidence": round(new_conf, 3)},
+            "virality_score": out.virality_score,
+            "previous": previous,
+            "diff": {
+                "origin_label_changed": previous.get("origin_label") not in (None, new_label),
+                "origin_confidence_delta": conf_delta,
+                "virality_score_delta": (
+                    out.virality_score - int(prev_virality) if prev_virality is not None else None
+                ),
+            },
+        })
+
+    if save and outputs:
+        store.write_scores(outputs)
+
+    return records
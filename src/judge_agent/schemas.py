@@ -1,7 +1,7 @@
 from __future__ import annotations
 from pydantic import BaseModel, Field
 from typing import Any, Dict, List, Literal, Optional
-from pydantic import field_serializer
+from pydantic import field_serializer, model_serializer
 
 OriginLabel = Literal["ai_generated", "human_generated"]
 
@@ -27,3 +27,12 @@ class JudgeOutput(BaseModel):
     distribution_analysis: List[AudienceSegment]
     explanations: Dict[str, str]
     debug: Optional[Dict[str, Any]] = None
+    cascade: Optional[Dict[str, Any]] = None
+
+    @model_serializer(mode="wrap")
+    def _omit_unused_cascade(self, handler):
+        # The cascade trace only appears when the cascade ran, so plain outputs keep their shape.
+        data = handler(self)
+        if self.cascade is None:
+            data.pop("cascade", None)
+        return data
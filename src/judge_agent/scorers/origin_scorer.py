@@ -52,19 +52,22 @@ def score_origin(features: Dict[str, Any]) -> Tuple[str, float, str]:
     # Video signals
     if "video" in features:
         v = features["video"]
-        motion = float(v.get("motion_score", 0.0))
-        sharp = float(v.get("sharpness_score", 0.0))
-        overlay = float(v.get("text_overlay_likelihood", 0.0))
         dur = float(v.get("duration_s", 0.0))
 
-        # Low motion + very sharp + heavy overlay can resemble templated AI short clips
-        if motion < 6.0:
-            score += 0.4
-            notes.append("low motion")
-        if sharp > 250.0:
-            score += 0.4
-            notes.append("very sharp frames")
-        score += 0.6 * overlay
+        # Frame signals are absent when a cascade skipped decoding (metadata only)
+        if "motion_score" in v:
+            motion = float(v.get("motion_score", 0.0))
+            sharp = float(v.get("sharpness_score", 0.0))
+            overlay = float(v.get("text_overlay_likelihood", 0.0))
+
+            # Low motion + very sharp + heavy overlay can resemble templated AI short clips
+            if motion < 6.0:
+                score += 0.4
+                notes.append("low motion")
+            if sharp > 250.0:
+                score += 0.4
+                notes.append("very sharp frames")
+            score += 0.6 * overlay
 
         if dur and dur < 12:
             score += 0.2
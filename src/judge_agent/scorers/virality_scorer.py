@@ -44,9 +44,6 @@ def score_virality(features: Dict[str, Any]) -> Tuple[int, str]:
     if "video" in features:
         v = features["video"]
         dur = float(v.get("duration_s", 0.0))
-        motion = float(v.get("motion_score", 0.0))
-        overlay = float(v.get("text_overlay_likelihood", 0.0))
-        bright = float(v.get("avg_brightness", 0.0))
 
         if dur:
             if 7 <= dur <= 35:
@@ -56,21 +53,36 @@ def score_virality(features: Dict[str, Any]) -> Tuple[int, str]:
                 score -= 8
                 reasons.append("longer duration reduces completion rates")
 
-        if overlay > 0.35:
-            score += 10
-            reasons.append("on-screen text can improve retention without audio")
+        # Frame signals are absent when a cascade skipped decoding (metadata only)
+        if "motion_score" in v:
+            motion = float(v.get("motion_score", 0.0))
+            overlay = float(v.get("text_overlay_likelihood", 0.0))
+            bright = float(v.get("avg_brightness", 0.0))
 
-        if motion > 8.0:
-            score += 6
-            reasons.append("moderate motion keeps attention")
-        elif motion < 3.0:
-            score -= 4
-            reasons.append("very low motion risks looking static")
+            if overlay > 0.35:
+                score += 10
+                reasons.append("on-screen text can improve retention without audio")
 
-        if bright and bright > 130:
-            score += 3
-            reasons.append("bright visuals tend to perform better on mobile")
+            if motion > 8.0:
+                score += 6
+                reasons.append("moderate motion keeps attention")
+            elif motion < 3.0:
+                score -= 4
+                reasons.append("very low motion risks looking static")
+
+            if bright and bright > 130:
+                score += 3
+                reasons.append("bright visuals tend to perform better on mobile")
 
     score = int(np.clip(score, 0, 100))
     explanation = "; ".join(reasons) if reasons else "No strong virality boosters detected; baseline score applied."
     return score, explanation
+
+
+def virality_bucket(score: int) -> str:
+    """Coarse bucket used by the web UI badge: low (<45), medium (45-69), high (>=70)."""
+    if score >= 70:
+        return "high"
+    if score >= 45:
+        return "medium"
+    return "low"
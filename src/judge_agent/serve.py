@@ -0,0 +1,222 @@
+from __future__ import annotations
+import importlib
+import os
+import random
+import signal
+import socket
+import time
+from multiprocessing.sharedctypes import RawArray
+from typing import Any, Dict, List, Optional
+
+# Imported once in the master so forked workers share the pages copy-on-write.
+PRELOAD_MODULES = (
+    "numpy",
+    "cv2",
+    "judge_agent.pipeline",
+    "judge_agent.feature_extractors.text_features",
+    "judge_agent.feature_extractors.video_features",
+    "judge_agent.feature_extractors.audio_features",
+    "judge_agent.web",
+)
+
+_FIELDS = ("pid", "started_at", "requests", "in_flight", "last_request_at", "restarts")
+
+
+class WorkerTable:
+    """
+    Per-worker health/load counters in shared memory (one row per worker slot).
+
+    Created by the master before forking; each worker only writes its own row,
+    and any worker can read every row to answer /health.
+    """
+
+    def __init__(self, slots: int):
+        self.slots = slots
+        self._data = RawArray("d", slots * len(_FIELDS))
+
+    def _idx(self, slot: int, field: str) -> int:
+        return slot * len(_FIELDS) + _FIELDS.index(field)
+
+    def get(self, slot: int, field: str) -> float:
+        return self._data[self._idx(slot, field)]
+
+    def set(self, slot: int, field: str, value: float) -> None:
+        self._data[self._idx(slot, field)] = value
+
+    def register(self, slot: int, pid: int) -> None:
+        restarts = self.get(slot, "restarts") + (1 if self.get(slot, "pid") else 0)
+        for field in _FIELDS:
+            self.set(slot, field, 0.0)
+        self.set(slot, "pid", pid)
+        self.set(slot, "started_at", time.time())
+        self.set(slot, "restarts", restarts)
+
+    def request_started(self, slot: int) -> None:
+        self.set(slot, "in_flight", self.get(slot, "in_flight") + 1)
+
+    def request_finished(self, slot: int) -> None:
+        self.set(slot, "in_flight", max(self.get(slot, "in_flight") - 1, 0))
+        self.set(slot, "requests", self.get(slot, "requests") + 1)
+        self.set(slot, "last_request_at", time.time())
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        now = time.time()
+        rows = []
+        for slot in range(self.slots):
+            pid = int(self.get(slot, "pid"))
+            started = self.get(slot, "started_at")
+            last = self.get(slot, "last_request_at")
+            rows.append({
+                "slot": slot,
+                "pid": pid,
+                "alive": _pid_alive(pid),
+                "uptime_s": round(now - started, 1) if started else None,
+                "requests": int(self.get(slot, "requests")),
+                "in_flight": int(self.get(slot, "in_flight")),
+                "idle_s": round(now - last, 1) if last else None,
+                "restarts": int(self.get(slot, "restarts")),
+                "rss_mb": _rss_mb(pid),
+            })
+        return rows
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _rss_mb(pid: int) -> Optional[float]:
+    # Linux only; other platforms report None.
+    try:
+        with open(f"/proc/{pid}/statm", "r") as fh:
+            resident_pages = int(fh.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return round(resident_pages * os.sysconf("SC_PAGE_SIZE") / 2**20, 1)
+
+
+def preload() -> None:
+    for name in PRELOAD_MODULES:
+        importlib.import_module(name)
+
+    from judge_agent.web import templates
+
+    # Compile the page template once so workers inherit the cached template.
+    templates.get_template("index.html")
+
+
+def _bind(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(sock: socket.socket, slot: int, max_requests: Optional[int], log_level: str) -> None:
+    import uvicorn
+    from judge_agent.web import app
+
+    app.state.worker_slot = slot
+    config = uvicorn.Config(
+        app,
+        log_level=log_level,
+        limit_max_requests=max_requests,
+        timeout_graceful_shutdown=30,
+    )
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    workers: int = 2,
+    max_requests: Optional[int] = None,
+    max_requests_jitter: int = 0,
+    log_level: str = "info",
+) -> None:
+    """
+    Pre-forking server: preload modules, bind once, fork `workers` uvicorn processes on the
+    shared socket. A worker that exits (e.g. after max_requests, to cap memory growth from
+    video decoding) is replaced in the same slot; SIGINT/SIGTERM stop all workers gracefully.
+    """
+    if workers < 1:
+        raise ValueError("workers must be >= 1.")
+
+    if not hasattr(os, "fork"):
+        # No fork (e.g. Windows): let uvicorn spawn workers; no preload sharing or worker table.
+        import uvicorn
+
+        uvicorn.run(
+            "judge_agent.web:app", host=host, port=port, workers=workers,
+            limit_max_requests=max_requests, log_level=log_level,
+        )
+        return
+
+    preload()
+    from judge_agent.web import app
+
+    table = WorkerTable(workers)
+    app.state.worker_table = table
+    sock = _bind(host, port)
+
+    children: Dict[int, int] = {}
+    stopping = False
+
+    def spawn(slot: int) -> None:
+        limit = max_requests + random.randint(0, max_requests_jitter) if max_requests else None
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            code = 0
+            try:
+                table.register(slot, os.getpid())
+                _run_worker(sock, slot, limit, log_level)
+            except BaseException:
+                code = 1
+            finally:
+                os._exit(code)
+        children[pid] = slot
+
+    def stop(signum, _frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    print(f"judge-agent-web: master {os.getpid()} serving http://{host}:{port} with {workers} workers")
+    for slot in range(workers):
+        spawn(slot)
+
+    try:
+        while children:
+            try:
+                pid, _status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            slot = children.pop(pid, None)
+            if slot is None or stopping:
+                continue
+            # Back off if a worker dies right after starting, instead of fork-looping.
+            if time.time() - table.get(slot, "started_at") < 1.0:
+                time.sleep(1.0)
+            spawn(slot)
+    finally:
+        sock.close()
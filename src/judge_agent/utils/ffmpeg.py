@@ -1,5 +1,6 @@
 from __future__ import annotations
 import subprocess
+from typing import Any, Callable, Iterator
 
 
 def run(cmd: list[str]) -> None:
@@ -31,3 +32,36 @@ def probe(video_path: str) -> dict:
             k, v = line.split("=", 1)
             meta[k.strip()] = v.strip()
     return meta
+
+
+def iter_keyframes_gray(video_path: str, width: int, height: int, next_buffer: Callable[[], Any]) -> Iterator[Any]:
+    # Requires ffmpeg installed. Decodes I-frames only and reads each raw 8-bit gray frame
+    # straight into next_buffer() (any writable width*height-byte buffer), which is yielded.
+    cmd = [
+        "ffmpeg", "-v", "error",
+        "-skip_frame", "nokey", "-noautorotate",
+        "-i", video_path,
+        "-an", "-vsync", "vfr",
+        "-f", "rawvideo", "-pix_fmt", "gray",
+        "-",
+    ]
+    frame_bytes = width * height
+    p = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        while True:
+            buf = next_buffer()
+            view = memoryview(buf).cast("B")
+            if len(view) != frame_bytes:
+                raise ValueError(f"Expected a {frame_bytes}-byte frame buffer, got {len(view)} bytes.")
+            filled = 0
+            while filled < frame_bytes:
+                n = p.stdout.readinto(view[filled:])
+                if not n:
+                    return
+                filled += n
+            yield buf
+    finally:
+        p.stdout.close()
+        if p.poll() is None:
+            p.kill()
+        p.wait()
@@ -1,20 +1,48 @@
 from __future__ import annotations
 
+import argparse
+import os
 import tempfile
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 from fastapi import FastAPI, File, Form, UploadFile
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
+from starlette.concurrency import run_in_threadpool
 from starlette.requests import Request
 
+from judge_agent.feature_extractors.video_features import VIDEO_MODES
 from judge_agent.pipeline import judge
 
 BASE_DIR = Path(__file__).resolve().parent
 templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
 
 app = FastAPI(title="Judge Agent Web")
+# Set by judge_agent.serve in multi-process mode (shared-memory load table + this worker's slot).
+app.state.worker_table = None
+app.state.worker_slot = None
+
+@app.middleware("http")
+async def track_worker_load(request: Request, call_next):
+    table, slot = app.state.worker_table, app.state.worker_slot
+    if table is None or slot is None:
+        return await call_next(request)
+    table.request_started(slot)
+    try:
+        return await call_next(request)
+    finally:
+        table.request_finished(slot)
+
+@app.get("/health")
+def health():
+    table = app.state.worker_table
+    return {
+        "status": "ok",
+        "pid": os.getpid(),
+        "worker_slot": app.state.worker_slot,
+        "workers": table.snapshot() if table is not None else None,
+    }
 
 @app.get("/", response_class=HTMLResponse)
 def home(request: Request):
@@ -27,12 +55,15 @@ async def judge_endpoint(
     transcript: Optional[UploadFile] = File(None),
     fps_sample: float = Form(1.0),
     max_frames: int = Form(60),
+    mode: str = Form("frames"),
     debug: bool = Form(False),
 ):
     if fps_sample <= 0:
         return JSONResponse({"error": "fps_sample must be greater than 0."}, status_code=400)
     if max_frames <= 0:
         return JSONResponse({"error": "max_frames must be greater than 0."}, status_code=400)
+    if mode not in VIDEO_MODES:
+        return JSONResponse({"error": f"mode must be one of {', '.join(VIDEO_MODES)}."}, status_code=400)
 
     # Save uploads to temp files
     try:
@@ -49,15 +80,18 @@ async def judge_endpoint(
                 transcript_path = td_path / tr_name
                 transcript_path.write_bytes(await transcript.read())
 
+            # judge() is CPU-bound; run it off the event loop so /health and other requests stay responsive.
             if content_type == "text":
                 text = in_path.read_text(encoding="utf-8", errors="ignore")
-                out = judge(text=text, include_debug=debug)
+                out = await run_in_threadpool(judge, text=text, include_debug=debug)
             elif content_type == "video":
-                out = judge(
+                out = await run_in_threadpool(
+                    judge,
                     video_path=str(in_path),
                     transcript_path=str(transcript_path) if transcript_path else None,
                     fps_sample=float(fps_sample),
                     max_frames=int(max_frames),
+                    mode=mode,
                     include_debug=debug,
                 )
             else:
@@ -67,9 +101,40 @@ async def judge_endpoint(
     except Exception as exc:
         return JSONResponse({"error": str(exc)}, status_code=500)
 
-def main():
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="judge-agent-web", description="Judge Agent web UI and API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers", type=int, default=0,
+        help="Production mode: preload modules and prefork N worker processes (0 = dev server with reload).",
+    )
+    parser.add_argument(
+        "--max-requests", type=int, default=None,
+        help="Recycle a worker after this many requests to bound memory growth (production mode).",
+    )
+    parser.add_argument(
+        "--max-requests-jitter", type=int, default=0,
+        help="Add up to this many requests to each worker's limit so workers do not recycle together.",
+    )
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+
+    if args.workers > 0:
+        from judge_agent.serve import serve
+
+        serve(
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            max_requests=args.max_requests,
+            max_requests_jitter=args.max_requests_jitter,
+            log_level=args.log_level,
+        )
+        return
+
     import uvicorn
-    uvicorn.run("judge_agent.web:app", host="127.0.0.1", port=8000, reload=True)
+    uvicorn.run("judge_agent.web:app", host=args.host, port=args.port, reload=True, log_level=args.log_level)
 
 if __name__ == "__main__":
     main()
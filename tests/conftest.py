@@ -0,0 +1,20 @@
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def write_clip():
+    """Writes a small MJPG clip (brightness ramp plus a moving box) and returns its path."""
+    cv2 = pytest.importorskip("cv2")
+
+    def write(path, n_frames=45, size=(160, 120)):
+        w, h = size
+        writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 15, (w, h))
+        for i in range(n_frames):
+            frame = np.full((h, w, 3), (i * 5) % 255, np.uint8)
+            cv2.rectangle(frame, ((i * 4) % w, 20), ((i * 4) % w + 30, 60), (255, 255, 255), -1)
+            writer.write(frame)
+        writer.release()
+        return path
+
+    return write
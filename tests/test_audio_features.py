@@ -0,0 +1,21 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from judge_agent.feature_extractors import audio_features
+
+
+def test_audio_extraction_uses_a_private_temp_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    used = []
+
+    def fake_extract_audio(_video_path, out_wav):
+        used.append(out_wav)
+        with open(out_wav, "wb") as fh:
+            fh.write(b"RIFF")
+
+    monkeypatch.setattr(audio_features, "extract_audio", fake_extract_audio)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(audio_features.extract_audio_features, ["clip.mp4"] * 8))
+
+    assert all(r.has_audio for r in results)
+    assert len(set(used)) == 8
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,47 @@
+import pytest
+
+pytest.importorskip("cv2")
+
+from judge_agent.feature_extractors import video_features
+from judge_agent.pipeline import judge
+
+
+@pytest.fixture
+def clip(tmp_path, monkeypatch, write_clip):
+    monkeypatch.setattr(video_features, "probe", lambda _path: {"duration": "20.0", "width": "160", "height": "120"})
+    return write_clip(tmp_path / "clip.avi", n_frames=30)
+
+
+def test_cascade_skips_frames_when_transcript_decides(clip, tmp_path):
+    transcript = tmp_path / "t.txt"
+    transcript.write_text(
+        "As an AI language model, here are 3 tips: 1. Plan 2. Plan 3. Plan. Like and subscribe!",
+        encoding="utf-8",
+    )
+
+    out = judge(video_path=str(clip), transcript_path=str(transcript), cascade=True)
+    assert out.cascade["tiers_run"] == ["metadata", "transcript"]
+    assert out.cascade["tiers_skipped"] == ["frames", "audio"]
+    assert out.origin_prediction.label == "ai_generated"
+
+
+def test_cascade_runs_full_decode_without_cheap_signal(clip):
+    out = judge(video_path=str(clip), cascade=True, cascade_confidence=0.99)
+    assert out.cascade["tiers_run"] == ["metadata", "frames", "audio"]
+    assert out.cascade["tiers_skipped"] == []
+    assert out.model_dump()["virality_score"] == judge(video_path=str(clip)).virality_score
+
+
+def test_output_omits_cascade_when_not_run(clip):
+    assert "cascade" not in judge(video_path=str(clip)).model_dump()
+    assert "cascade" in judge(video_path=str(clip), cascade=True).model_dump()
+
+
+def test_cascade_probes_the_video_once(clip, monkeypatch):
+    calls = []
+    meta = {"duration": "20.0", "width": "160", "height": "120"}
+    monkeypatch.setattr(video_features, "probe", lambda path: calls.append(path) or meta)
+
+    out = judge(video_path=str(clip), cascade=True, cascade_confidence=0.99)
+    assert "frames" in out.cascade["tiers_run"]
+    assert calls == [str(clip)]
@@ -0,0 +1,83 @@
+import numpy as np
+
+from judge_agent.feature_store import FeatureStore
+from judge_agent.pipeline import judge, rescore
+
+
+def test_store_roundtrip_and_rescore(tmp_path):
+    store_dir = tmp_path / "store"
+    a = judge(
+        text="Here are 5 tips: 1. Sleep 2. Plan 3. Focus. Like and subscribe!", feature_store=str(store_dir), item_id="tips"
+    )
+    b = judge(text="I walked the dog this morning and it rained the whole way.", feature_store=str(store_dir), item_id="dog")
+
+    store = FeatureStore(store_dir)
+    assert len(store) == 2
+    cols = store.load()
+    assert list(cols["_id"]) == ["tips", "dog"]
+    assert len(list(store_dir.glob("seg-*"))) == 2
+
+    store.compact()
+    assert len(list(store_dir.glob("seg-*"))) == 1
+    cols = store.load()
+    assert isinstance(cols["text.n_words"], np.memmap)
+    assert list(cols["_id"]) == ["tips", "dog"]
+
+    records = rescore(str(store_dir))
+    assert [r["virality_score"] for r in records] == [a.virality_score, b.virality_score]
+    assert all(not r["diff"]["origin_label_changed"] for r in records)
+    assert all(r["diff"]["virality_score_delta"] == 0 for r in records)
+
+
+def _append_texts(store_dir, worker, n):
+    for i in range(n):
+        judge(text=f"Worker {worker} item {i}: here are some notes.", feature_store=store_dir, item_id=f"{worker}-{i}")
+
+
+def test_store_survives_concurrent_writer_processes(tmp_path):
+    import multiprocessing
+
+    store_dir = str(tmp_path / "store")
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=_append_texts, args=(store_dir, w, 10)) for w in range(3)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(timeout=120)
+        assert p.exitcode == 0
+
+    store = FeatureStore(store_dir)
+    assert len(store) == 30
+    assert sorted(store.load()["_id"]) == sorted(f"{w}-{i}" for w in range(3) for i in range(10))
+    assert len(store.load()["text.n_words"]) == 30
+
+
+def test_store_merges_segments_size_tiered(tmp_path):
+    from judge_agent.feature_store import MERGE_FANOUT
+
+    store_dir = tmp_path / "store"
+    texts = [f"Post {i}: here are 3 tips" for i in range(MERGE_FANOUT + 1)]
+    for i, text in enumerate(texts):
+        judge(text=text, feature_store=str(store_dir), item_id=str(i))
+
+    # The first MERGE_FANOUT single-row segments were merged into one.
+    assert len(list(store_dir.glob("seg-*"))) == 2
+    store = FeatureStore(store_dir)
+    assert len(store) == len(texts)
+    assert list(store.load()["_id"]) == [str(i) for i in range(len(texts))]
+
+
+def test_store_append_many_large_batch(tmp_path):
+    out = judge(text="Here are 3 tips for a calm morning.")
+    rows = [(f"item-{i}", {"text": {"n_words": i, "score": i / 2}}, out) for i in range(5000)]
+
+    store = FeatureStore(tmp_path / "store")
+    store.append_many(rows)
+
+    assert len(store) == 5000
+    cols = store.load()
+    assert list(cols["_id"][:2]) == ["item-0", "item-1"]
+    assert cols["text.n_words"][-1] == 4999
+    items = list(store.iter_items())
+    assert items[1234][0] == "item-1234"
+    assert items[1234][1]["text"] == {"n_words": 1234, "score": 617.0}
@@ -0,0 +1,46 @@
+import pytest
+
+pytest.importorskip("uvicorn")
+
+from judge_agent.loadtest import parse_mix, run_loadtest
+
+
+def test_loadtest_reports_latency_against_local_server():
+    report = run_loadtest(server="thread", concurrency=2, total_requests=4)
+    results = report["results"]
+    assert results["requests"] == 4
+    assert results["errors"] == 0
+    assert {"p50_ms", "p95_ms", "p99_ms"} <= set(results["latency"])
+    assert set(results["by_kind"]) == {"text"}
+
+
+def test_loadtest_rejects_mix_without_inputs():
+    assert parse_mix("text=3,video=1") == {"text": 0.75, "video": 0.25}
+    with pytest.raises(ValueError, match="no video inputs"):
+        run_loadtest(url="http://127.0.0.1:1", mix="video=1", total_requests=1)
+
+
+def test_loadtest_can_launch_web_entry_point_in_production_mode():
+    report = run_loadtest(server="web", server_args=["--workers", "1", "--max-requests", "2"], total_requests=4)
+    assert report["config"]["server"] == "web"
+    assert report["results"]["requests"] == 4
+    assert report["results"]["errors"] == 0
+
+
+def test_git_revision_ignores_unrelated_enclosing_repo(tmp_path, monkeypatch):
+    import shutil
+    import subprocess
+
+    from judge_agent import loadtest
+
+    if shutil.which("git") is None:
+        pytest.skip("git not installed")
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "--allow-empty", "-m", "other"],
+        cwd=tmp_path, check=True,
+    )
+    for installed in (tmp_path / "venv" / "site-packages" / "judge_agent", tmp_path / "vendor" / "src" / "judge_agent"):
+        installed.mkdir(parents=True)
+        monkeypatch.setattr(loadtest, "__file__", str(installed / "loadtest.py"))
+        assert loadtest._git_revision() is None
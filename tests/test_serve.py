@@ -0,0 +1,24 @@
+import os
+
+from judge_agent.serve import WorkerTable
+
+
+def test_worker_table_tracks_load_and_restarts():
+    table = WorkerTable(2)
+    table.register(0, os.getpid())
+    table.request_started(0)
+    table.request_finished(0)
+    table.request_started(0)
+
+    row = table.snapshot()[0]
+    assert row["pid"] == os.getpid()
+    assert row["alive"] is True
+    assert row["requests"] == 1
+    assert row["in_flight"] == 1
+    assert row["restarts"] == 0
+
+    table.register(0, os.getpid())
+    row = table.snapshot()[0]
+    assert row["restarts"] == 1
+    assert row["requests"] == 0
+    assert table.snapshot()[1]["alive"] is False
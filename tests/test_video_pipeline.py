@@ -0,0 +1,100 @@
+import pytest
+
+pytest.importorskip("cv2")
+
+from judge_agent.feature_extractors import video_features
+
+
+def test_pipelined_matches_serial(tmp_path, monkeypatch, write_clip):
+    monkeypatch.setattr(video_features, "probe", lambda _path: {})
+    path = write_clip(tmp_path / "clip.avi")
+
+    serial = video_features.extract_video_features(str(path), fps_sample=5.0, max_frames=12)
+    piped = video_features.extract_video_features(
+        str(path), fps_sample=5.0, max_frames=12, workers=3, queue_depth=2
+    )
+    assert serial.sampled_frames == 12
+    assert piped.as_dict() == serial.as_dict()
+
+
+def test_pipelined_surfaces_decode_errors(tmp_path, monkeypatch):
+    monkeypatch.setattr(video_features, "probe", lambda _path: {})
+    with pytest.raises(RuntimeError, match="Could not open video"):
+        video_features.extract_video_features(str(tmp_path / "missing.mp4"), workers=2)
+
+
+def _fake_keyframes(video_path, width, height, next_buffer):
+    for level in (10, 120, 40, 200):
+        buf = next_buffer()
+        buf[...] = level
+        yield buf
+
+
+def test_keyframes_mode_marks_motion_approximate(tmp_path, monkeypatch, write_clip):
+    from judge_agent.pipeline import judge
+
+    monkeypatch.setattr(video_features, "probe", lambda _path: {"duration": "3.0", "width": "160", "height": "120"})
+    monkeypatch.setattr(video_features, "iter_keyframes_gray", _fake_keyframes)
+    path = write_clip(tmp_path / "clip.avi")
+
+    feats = video_features.extract_video_features(str(path), mode="keyframes")
+    assert feats.mode == "keyframes"
+    assert feats.approximate_motion
+    assert feats.sampled_frames == 4
+    assert feats.brightness_max == pytest.approx(200.0)
+
+    out = judge(video_path=str(path), mode="keyframes")
+    assert "approximate" in out.explanations["video_sampling"]
+    assert "video_sampling" not in judge(video_path=str(path)).explanations
+
+
+def test_keyframes_mode_falls_back_to_frames_without_ffmpeg(tmp_path, monkeypatch, write_clip):
+    def missing_ffmpeg(*_args):
+        raise FileNotFoundError("ffmpeg")
+
+    monkeypatch.setattr(video_features, "probe", lambda _path: {"duration": "3.0", "width": "160", "height": "120"})
+    monkeypatch.setattr(video_features, "iter_keyframes_gray", missing_ffmpeg)
+    path = write_clip(tmp_path / "clip.avi")
+
+    feats = video_features.extract_video_features(str(path), mode="keyframes")
+    assert feats.mode == "frames"
+    assert not feats.approximate_motion
+    assert feats.as_dict() == video_features.extract_video_features(str(path)).as_dict()
+
+
+def test_running_stats_match_per_frame_values(tmp_path, monkeypatch, write_clip):
+    import cv2
+    import numpy as np
+
+    monkeypatch.setattr(video_features, "probe", lambda _path: {})
+    path = write_clip(tmp_path / "clip.avi", n_frames=20)
+    feats = video_features.extract_video_features(str(path), fps_sample=15.0, max_frames=20)
+
+    # Per-frame values as the original list-based implementation collected them.
+    brights, sharps, motions, overlays = [], [], [], []
+    cap = cv2.VideoCapture(str(path))
+    prev = None
+    while True:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        brights.append(float(np.mean(gray)))
+        sharps.append(float(cv2.Laplacian(gray, cv2.CV_64F).var()))
+        if prev is not None:
+            motions.append(float(np.mean(cv2.absdiff(gray, prev))))
+        prev = gray
+        band = gray[int(0.80 * gray.shape[0]):, :]
+        overlays.append(float(np.mean(cv2.Canny(band, 80, 160))) / 255.0)
+    cap.release()
+
+    assert feats.sampled_frames == len(brights) == 20
+    assert feats.avg_brightness == pytest.approx(np.mean(brights))
+    assert feats.motion_score == pytest.approx(np.mean(motions))
+    assert feats.sharpness_score == pytest.approx(np.mean(sharps))
+    assert feats.text_overlay_likelihood == pytest.approx(float(np.clip(np.mean(overlays) * 5.0, 0.0, 1.0)))
+    named = (("brightness", brights), ("motion", motions), ("sharpness", sharps), ("overlay_edge", overlays))
+    for name, values in named:
+        assert getattr(feats, f"{name}_var") == pytest.approx(np.var(values))
+        assert getattr(feats, f"{name}_min") == pytest.approx(min(values))
+        assert getattr(feats, f"{name}_max") == pytest.approx(max(values))
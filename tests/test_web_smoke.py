@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 
@@ -41,3 +43,77 @@ def test_web_rejects_invalid_fps_sample():
     resp = client.post("/judge", files=files, data=data)
     assert resp.status_code == 400
     assert "fps_sample must be greater than 0" in resp.json()["error"]
+
+
+def test_web_rejects_invalid_mode():
+    client = TestClient(app)
+
+    files = {"file": ("sample.txt", b"test")}
+    data = {
+        "content_type": "video",
+        "fps_sample": "1.0",
+        "max_frames": "60",
+        "mode": "everything",
+        "debug": "false",
+    }
+
+    resp = client.post("/judge", files=files, data=data)
+    assert resp.status_code == 400
+    assert "mode must be" in resp.json()["error"]
+
+
+def test_web_health_single_process():
+    client = TestClient(app)
+
+    resp = client.get("/health")
+    assert resp.status_code == 200
+    payload = resp.json()
+    assert payload["status"] == "ok"
+    assert payload["workers"] is None
+
+
+def test_web_health_answers_while_judge_is_running(monkeypatch):
+    import threading
+    import time
+    import urllib.request
+
+    from judge_agent import web
+    from judge_agent.loadtest import _multipart, local_server
+    from judge_agent.serve import WorkerTable
+
+    real_judge = web.judge
+    release = threading.Event()
+
+    def slow_judge(**kwargs):
+        release.wait(timeout=10)
+        return real_judge(**kwargs)
+
+    monkeypatch.setattr(web, "judge", slow_judge)
+    monkeypatch.setattr(app.state, "worker_table", WorkerTable(1))
+    monkeypatch.setattr(app.state, "worker_slot", 0)
+
+    body, content_type = _multipart({"content_type": "text"}, "sample.txt", b"Here are 3 tips.")
+    statuses = []
+    with local_server("thread") as base:
+        def post():
+            req = urllib.request.Request(f"{base}/judge", data=body, headers={"Content-Type": content_type})
+            with urllib.request.urlopen(req, timeout=20) as resp:
+                statuses.append(resp.status)
+
+        posts = [threading.Thread(target=post) for _ in range(2)]
+        for t in posts:
+            t.start()
+        try:
+            deadline = time.monotonic() + 10
+            in_flight = 0
+            while in_flight < 3 and time.monotonic() < deadline:
+                with urllib.request.urlopen(f"{base}/health", timeout=2) as resp:
+                    in_flight = json.loads(resp.read())["workers"][0]["in_flight"]
+        finally:
+            release.set()
+            for t in posts:
+                t.join(timeout=20)
+
+    # Both slow requests plus the /health request itself.
+    assert in_flight == 3
+    assert statuses == [200, 200]